@@ -190,7 +190,7 @@ class MainToolbar(AbstractToolbar):
                 output.frame_to_show = frame
 
     def on_current_output_changed(self, index: int, prev_index: int) -> None:
-        qt_silent_call(self.outputs_combobox.setCurrentIndex, index)
+        self.outputs_combobox.setCurrentIndexSilent(index)
         qt_silent_call(self.frame_control.setMaximum,
                        self.main.current_output.end_frame)
         qt_silent_call(self. time_control.setMaximum,
@@ -772,7 +772,8 @@ class MainWindow(AbstractMainWindow):
             for attr_name in self.storable_attrs
         }
         state.update({
-            'timeline_mode': self.timeline.mode,
+            # stored as a plain string
+            'timeline_mode': self.timeline.mode.value,
             'window_geometry': bytes(self.saveGeometry()),
             'window_state': bytes(self.saveState()),
         })
@@ -851,19 +852,19 @@ def main() -> None:
 
 
 def check_versions() -> bool:
-    from pkg_resources import get_distribution
-    from platform import python_version
+    from importlib.metadata import version
 
     failed = False
 
     if sys.version_info < (3, 9, 0, 'final', 0):
         logging.warning('VSPreview is not tested on Python versions prior to 3.9, but you have {} {}. Use at your own risk.'
-                        .format(python_version(), sys.version_info.releaselevel))
+                        .format('.'.join(map(str, sys.version_info[:3])), sys.version_info.releaselevel))
         failed = True
 
-    if get_distribution('PyQt5').version < '5.15':
+    pyqt_version = version('PyQt5')
+    if tuple(map(int, pyqt_version.split('.')[:2])) < (5, 15):
         logging.warning('VSPreview is not tested on PyQt5 versions prior to 5.15, but you have {}. Use at your own risk.'
-                        .format(get_distribution('PyQt5').version))
+                        .format(pyqt_version))
         failed = True
 
     if vs.core.version_number() < 53:
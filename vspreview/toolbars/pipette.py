@@ -105,14 +105,19 @@ class PipetteToolbar(AbstractToolbar):
         layout.addStretch()
 
     def subscribe_on_mouse_events(self) -> None:
-        self.main.graphics_view.mouseMoved   .connect(self.mouse_moved)
-        self.main.graphics_view.mousePressed .connect(self.mouse_pressed)
-        self.main.graphics_view.mouseReleased.connect(self.mouse_released)
+        self.main.graphics_view.mouseMoveHandler    = self.mouse_moved
+        self.main.graphics_view.mousePressHandler   = self.mouse_pressed
+        self.main.graphics_view.mouseReleaseHandler = self.mouse_released
 
     def unsubscribe_from_mouse_events(self) -> None:
-        self.main.graphics_view.mouseMoved   .disconnect(self.mouse_moved)
-        self.main.graphics_view.mousePressed .disconnect(self.mouse_pressed)
-        self.main.graphics_view.mouseReleased.disconnect(self.mouse_released)
+        graphics_view = self.main.graphics_view
+        # don't drop handlers that were set by someone else
+        if graphics_view.mouseMoveHandler == self.mouse_moved:
+            graphics_view.mouseMoveHandler = None
+        if graphics_view.mousePressHandler == self.mouse_pressed:
+            graphics_view.mousePressHandler = None
+        if graphics_view.mouseReleaseHandler == self.mouse_released:
+            graphics_view.mouseReleaseHandler = None
 
     def on_script_unloaded(self) -> None:
         self.outputs.clear()
@@ -499,8 +499,7 @@ class SceningToolbar(AbstractToolbar):
         marks = Notches()
         if self.current_list is None:
             return marks
-        for scene in self.current_list:
-            marks.add(scene, cast(Qt.QColor, Qt.Qt.green))
+        marks.add_scenes(self.current_list, cast(Qt.QColor, Qt.Qt.green))
         return marks
 
     def is_notches_visible(self) -> bool:
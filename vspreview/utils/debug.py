@@ -1,14 +1,16 @@
 from __future__ import annotations
 
 from   functools import wraps
-import inspect
+import linecache
 import logging
 import re
+import sys
 from   time      import perf_counter_ns
-from   typing    import Any, Callable, cast, Dict, Type, TypeVar, Tuple, Union
+from   typing    import Any, Callable, Dict, TypeVar, Tuple, Union
+from   weakref   import WeakKeyDictionary
 
 from   pprint      import pprint
-from   PyQt5       import Qt, sip
+from   PyQt5       import Qt
 import vapoursynth as     vs
 
 from vspreview.core import AbstractMainWindow
@@ -16,33 +18,36 @@ from vspreview.core import AbstractMainWindow
 
 T = TypeVar('T')
 
+_VAR_RE = re.compile(r"\((.*)\)")
+
+# print every event processed by Application.notify(),
+# off by default, since it's done for every single event
+_VERBOSE = False
+
 
 def print_var(var: Any) -> None:
-    current_frame = inspect.currentframe()
-    if current_frame is None:
-        logging.debug('print_var(): current_frame is None')
+    if not logging.getLogger().isEnabledFor(logging.DEBUG):
         return
 
-    frame = current_frame.f_back
-    if current_frame.f_back is None:
-        logging.debug('print_var(): f_back is None')
+    frame = sys._getframe(1)  # pylint: disable=protected-access
 
-    context = inspect.getframeinfo(frame).code_context
-    if context is None:
-        logging.debug('print_var(): code_context is None')
+    s = linecache.getline(frame.f_code.co_filename, frame.f_lineno)
+    if s == '':
+        logging.debug('print_var(): source line is unavailable')
         return
-    s = context[0]
 
-    match = re.search(r"\((.*)\)", s)
+    match = _VAR_RE.search(s)
     if match is None:
         logging.debug('print_var(): match is None')
         return
     r = match.group(1)
-    logging.debug(f'{r}: {var}')
+    logging.debug('%s: %s', r, var)
 
 
 def print_func_name() -> None:
-    logging.debug(f'{inspect.stack()[1][3]}()')
+    if not logging.getLogger().isEnabledFor(logging.DEBUG):
+        return
+    logging.debug('%s()', sys._getframe(1).f_code.co_name)  # pylint: disable=protected-access
 
 
 class EventFilter(Qt.QObject):
@@ -50,90 +55,154 @@ class EventFilter(Qt.QObject):
         'main',
     )
 
+    traced_events = {
+        Qt.QEvent.Show: 'Show',
+        Qt.QEvent.Hide: 'Hide',
+    }
+
     def __init__(self, main: AbstractMainWindow) -> None:
         super().__init__()
         self.main = main
 
     def eventFilter(self, obj: Qt.QObject, event: Qt.QEvent) -> bool:
-        if   (event.type() == Qt.QEvent.Show):
-            logging.debug( '--------------------------------')
-            logging.debug(f'{obj.objectName()}')
-            logging.debug( 'event:       Show')
-            logging.debug(f'spontaneous: {event.spontaneous()}')
-            logging.debug( '')
-            self.print_toolbars_state()
-        elif (event.type() == Qt.QEvent.Hide):
-            logging.debug( '--------------------------------')
-            logging.debug(f'{obj.objectName()}')
-            logging.debug( 'event:       Hide')
-            logging.debug(f'spontaneous: {event.spontaneous()}')
-            logging.debug( '')
+        if not logging.getLogger().isEnabledFor(logging.DEBUG):
+            return False
+
+        event_name = self.traced_events.get(event.type())
+        if event_name is not None:
+            logging.debug(
+                '--------------------------------\n'
+                '%s\n'
+                'event:       %s\n'
+                'spontaneous: %s\n',
+                obj.objectName(), event_name, event.spontaneous())
             self.print_toolbars_state()
 
         # return Qt.QObject.eventFilter(object, event)
         return False
 
     def print_toolbars_state(self) -> None:
-        logging.debug(f'main toolbar:     {self.main.main_toolbar_widget.isVisible()}')
-        logging.debug(f'playback toolbar: {self.main.toolbars.playback  .isVisible()}')
-        logging.debug(f'scening toolbar:  {self.main.toolbars.scening   .isVisible()}')
-        logging.debug(f'misc toolbar:     {self.main.toolbars.misc      .isVisible()}')
+        logging.debug(
+            'main toolbar:     %s\n'
+            'playback toolbar: %s\n'
+            'scening toolbar:  %s\n'
+            'misc toolbar:     %s',
+            self.main.main_toolbar_widget.isVisible(),
+            self.main.toolbars.playback  .isVisible(),
+            self.main.toolbars.scening   .isVisible(),
+            self.main.toolbars.misc      .isVisible())
 
     def run_get_frame_test(self) -> None:
         N = 10
+        now = perf_counter_ns
+        overhead = calibrate_timer_overhead()
+        logging.debug('timer overhead: %d ns', overhead)
 
         start_frame_async = 1000
         total_async = 0
         for i in range(start_frame_async, start_frame_async + N):
-            s1 = perf_counter_ns()
+            s1 = now()
             f1 = self.main.current_output.vs_output.get_frame_async(i)
             f1.result()
-            s2 = perf_counter_ns()
-            logging.debug(f'async test time: {s2 - s1} ns')
+            s2 = now()
+            elapsed = s2 - s1 - overhead
+            logging.debug('async test time: %d ns', elapsed)
+            if elapsed < 10 * overhead:
+                logging.warning('async test time is within timer noise')
             if i != start_frame_async:
-                total_async += s2 - s1
+                total_async += elapsed
         logging.debug('')
 
         start_frame_sync = 2000
         total_sync = 0
         for i in range(start_frame_sync, start_frame_sync + N):
-            s1 = perf_counter_ns()
+            s1 = now()
             f2 = self.main.current_output.vs_output.get_frame(i)  # pylint: disable=unused-variable
-            s2 = perf_counter_ns()
-            logging.debug(f'sync test time: {s2 - s1} ns')
+            s2 = now()
+            elapsed = s2 - s1 - overhead
+            logging.debug('sync test time: %d ns', elapsed)
+            if elapsed < 10 * overhead:
+                logging.warning('sync test time is within timer noise')
             if i != start_frame_sync:
-                total_sync += s2 - s1
+                total_sync += elapsed
 
+        # first fetch of each run is excluded as a warm-up
         logging.debug('')
-        logging.debug(
-            f'Async average: {total_async / N - 1} ns, {1_000_000_000 / (total_async / N - 1)} fps')
-        logging.debug(
-            f'Sync average:  {total_sync  / N - 1} ns, {1_000_000_000 / (total_sync  / N - 1)} fps')
+        logging.debug('Async average: %s ns, %s fps',
+                      total_async / (N - 1), 1_000_000_000 / (total_async / (N - 1)))
+        logging.debug('Sync average:  %s ns, %s fps',
+                      total_sync  / (N - 1), 1_000_000_000 / (total_sync  / (N - 1)))
+
+
+def calibrate_timer_overhead(n: int = 100_000) -> int:
+    from statistics import median
+
+    now = perf_counter_ns
+    deltas = []
+    for _ in range(n):
+        t1 = now()
+        t2 = now()
+        deltas.append(t2 - t1)
+    return int(median(deltas))
 
 
 def measure_exec_time_ms(func: Callable[..., T], return_exec_time: bool = False, print_exec_time: bool = True) -> Callable[..., Union[T, Tuple[T, float]]]:
-    @wraps(func)
+    now = perf_counter_ns
+
     def decorator(*args: Any, **kwargs: Any) -> T:
-        t1 = perf_counter_ns()
+        t1 = now()
         ret = func(*args, **kwargs)
-        t2 = perf_counter_ns()
+        t2 = now()
         exec_time = (t2 - t1) / 1_000_000
         if print_exec_time:
-            logging.debug(f'{exec_time:7.3f} ms: {func.__name__}()')
+            logging.debug('%7.3f ms: %s()', exec_time, func.__name__)
         if return_exec_time:
             return ret, exec_time  # type: ignore
         return ret
+    # functools.wraps() is too heavy here, since this runs on every
+    # attribute access in GraphicsScene. Only the name is used anyway.
+    decorator.__name__ = func.__name__
     return decorator
 
 
 def print_perf_timepoints(*args: int) -> None:
     if len(args) < 2:
         raise ValueError('At least 2 timepoints required')
-    for i in range(1, len(args)):
-        logging.debug(f'{i}: {args[i] - args[i-1]} ns')
+    if not logging.getLogger().isEnabledFor(logging.DEBUG):
+        return
+
+    logging.debug('\n'.join(
+        f'{i}: {t2 - t1} ns'
+        for i, (t1, t2) in enumerate(zip(args, args[1:]), 1)))
 
 
 def profile_cpu(func: Callable[..., T]) -> Callable[..., T]:
+    '''
+    Uses pyinstrument, which is optional.
+    Falls back to profile_cpu_deterministic() when it's not installed.
+    '''
+    @wraps(func)
+    def decorator(*args: Any, **kwargs: Any) -> T:
+        # sampling profiler has bounded overhead, unlike cProfile,
+        # which instruments every call and skews the results
+        try:
+            from pyinstrument import Profiler  # type: ignore
+        except ImportError:
+            return profile_cpu_deterministic(func)(*args, **kwargs)
+
+        profiler = Profiler(interval=0.001)
+        profiler.start()
+        try:
+            ret = func(*args, **kwargs)
+        finally:
+            profiler.stop()
+
+        print(profiler.output_text())
+        return ret
+    return decorator
+
+
+def profile_cpu_deterministic(func: Callable[..., T]) -> Callable[..., T]:
     @wraps(func)
     def decorator(*args: Any, **kwargs: Any) -> T:
         from cProfile import Profile
@@ -153,33 +222,37 @@ def print_vs_output_colorspace_info(vs_output: vs.VideoNode) -> None:
     from vspreview.core import Output
 
     props = vs_output.get_frame(0).props
-    logging.debug('Matrix: {}, Transfer: {}, Primaries: {}, Range: {}'.format(
+    logging.debug(
+        'Matrix: %s, Transfer: %s, Primaries: %s, Range: %s',
         Output.Matrix   .values[props['_Matrix']]     if '_Matrix'     in props else None,
         Output.Transfer .values[props['_Transfer']]   if '_Transfer'   in props else None,
         Output.Primaries.values[props['_Primaries']]  if '_Primaries'  in props else None,
         Output.Range    .values[props['_ColorRange']] if '_ColorRange' in props else None,
-    ))
+    )
 
 
-class DebugMeta(sip.wrappertype):
-    def __new__(cls: Type[type], name: str, bases: Tuple[type, ...], dct: Dict[str, Any]) -> DebugMeta:
-        from functools import partialmethod
+# frequent events that are not worth timing in GraphicsScene.event()
+_UNTIMED_EVENTS = frozenset((
+    Qt.QEvent.MouseMove,
+    Qt.QEvent.Paint,
+    Qt.QEvent.HoverMove,
+    Qt.QEvent.GraphicsSceneMouseMove,
+    Qt.QEvent.GraphicsSceneHoverMove,
+))
 
-        base = bases[0]
-        for attr in dir(base):
-            if not attr.endswith('__') and callable(getattr(base, attr)):
-                dct[attr] = partialmethod(DebugMeta.dummy_method, attr)
-        subcls = super(DebugMeta, cls).__new__(cls, name, bases, dct)  # type: ignore
-        return cast(DebugMeta, subcls)
 
-    def dummy_method(self, name: str, *args: Any, **kwargs: Any) -> Any:
-        method = getattr(super(GraphicsScene, GraphicsScene), name)
-        method = measure_exec_time_ms(method)
-        return method(self, *args, **kwargs)
+# QGraphicsScene methods whose execution time GraphicsScene reports
+_TRACED_METHODS = frozenset(
+    attr for attr in dir(Qt.QGraphicsScene)
+    if not attr.endswith('__') and callable(getattr(Qt.QGraphicsScene, attr))
+)
 
 
-class GraphicsScene(Qt.QGraphicsScene, metaclass=DebugMeta):  # type: ignore
+class GraphicsScene(Qt.QGraphicsScene):
     def event(self, event: Qt.QEvent) -> bool:
+        if event.type() in _UNTIMED_EVENTS:
+            return super().event(event)
+
         t0 = perf_counter_ns()
         ret = super().event(event)
         t1 = perf_counter_ns()
@@ -192,8 +265,9 @@ class GraphicsScene(Qt.QGraphicsScene, metaclass=DebugMeta):  # type: ignore
 
     def __getattribute__(self, name: str) -> Any:
         attr = super().__getattribute__(name)
-        if callable(attr):
+        if name in _TRACED_METHODS:
             return measure_exec_time_ms(attr)
+        return attr
 
 
 qevent_info = {
@@ -429,52 +503,82 @@ qevent_info = {
 }
 
 
+_class_names: Dict[type, str] = {}
+
+
+def _class_name(obj: object) -> str:
+    ty = type(obj)
+    name = _class_names.get(ty)
+    if name is None:
+        name = _class_names[ty] = ty.__name__
+    return name
+
+
+# only non-empty names are cached, since they're usually assigned
+# after the object has already received some events
+_object_names: WeakKeyDictionary[Qt.QObject, str] = WeakKeyDictionary()
+
+
+def _object_name(obj: Qt.QObject) -> str:
+    try:
+        return _object_names[obj]
+    except (KeyError, TypeError):
+        pass
+
+    try:
+        name = obj.objectName()
+    except RuntimeError:
+        return ''
+
+    if name != '':
+        try:
+            _object_names[obj] = name
+        except TypeError:
+            pass
+    return name
+
+
 class Application(Qt.QApplication):
     enter_count = 0
 
     def notify(self, obj: Qt.QObject, event: Qt.QEvent) -> bool:
-        import sys
-
-        isex = False
         try:
-            self.enter_count += 1
-            ret, time = cast(
-                Tuple[bool, float],
-                measure_exec_time_ms(
-                    Qt.QApplication.notify, True, False)(self, obj, event))
-
-            if (type(event).__name__ == 'QEvent'
-                    and event.type() in qevent_info):
-                event_name = qevent_info[event.type()][0]
-            else:
-                event_name = type(event).__name__
+            return self._notify(obj, event)
+        except Exception:  # pylint: disable=broad-except
+            self._notify_failed()
+            return False
 
-            try:
-                obj_name = obj.objectName()
-            except RuntimeError:
-                obj_name = ''
+    def _notify(self, obj: Qt.QObject, event: Qt.QEvent) -> bool:
+        self.enter_count += 1
+        t1 = perf_counter_ns()
+        ret = Qt.QApplication.notify(self, obj, event)
+        time = (perf_counter_ns() - t1) / 1_000_000
 
+        if _VERBOSE:
+            event_name = _class_name(event)
+            if event_name == 'QEvent' and event.type() in qevent_info:
+                event_name = qevent_info[event.type()][0]
+
+            obj_name = _object_name(obj)
             if obj_name == '':
                 try:
-                    if (obj.parent() is not None
-                            and obj.parent().objectName() != ''):
-                        obj_name = '(parent) ' + obj.parent().objectName()
+                    parent = obj.parent()
                 except RuntimeError:
-                    pass
+                    parent = None
+                if parent is not None:
+                    parent_name = _object_name(parent)
+                    if parent_name != '':
+                        obj_name = '(parent) ' + parent_name
 
             recursive_indent = 2 * (self.enter_count - 1)
 
             print(
-                f'{time:7.3f} ms, receiver: {type(obj).__name__:>25}, event: {event.type():3d} {" " * recursive_indent + event_name:<30}, name: {obj_name}')
+                f'{time:7.3f} ms, receiver: {_class_name(obj):>25}, event: {event.type():3d} {" " * recursive_indent + event_name:<30}, name: {obj_name}')
 
-            self.enter_count -= 1
+        self.enter_count -= 1
 
-            return ret
-        except Exception:  # pylint: disable=broad-except
-            isex = True
-            logging.error('Application: unexpected error')
-            print(*sys.exc_info())
-            return False
-        finally:
-            if isex:
-                self.quit()
+        return ret
+
+    def _notify_failed(self) -> None:
+        logging.exception('Application: unexpected error')
+        self.quit()
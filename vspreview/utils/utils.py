@@ -1,10 +1,12 @@
 from __future__ import annotations
 
-from   functools import lru_cache, partial, wraps
+from   concurrent.futures import Future, ThreadPoolExecutor
+from   datetime           import timedelta
+from   functools          import lru_cache, wraps
 import logging
-from   string    import Template
-from   typing    import (
-    Any, Callable, cast, MutableMapping, Optional, Type,
+from   string             import Template
+from   typing             import (
+    Any, Callable, cast, FrozenSet, MutableMapping, Optional, Tuple, Type,
     TYPE_CHECKING, TypeVar, Union,
 )
 
@@ -17,50 +19,78 @@ from vspreview.utils import debug
 T = TypeVar('T')
 
 
+# Time and TimeInterval are mutable, so only immutable
+# intermediate values of the conversions are memoized
+
+@lru_cache(maxsize=256)
+def _timedelta_to_qtime_args(td: timedelta) -> Tuple[int, int, int, int]:
+    minutes_total, seconds = divmod(td.seconds, 60)
+    hours, minutes = divmod(minutes_total, 60)
+    return hours, minutes, seconds, td.microseconds // 1000
+
+
 def to_qtime(time: Union[TimeType]) -> Qt.QTime:
-    td = time.value
-    hours, secs_rem = divmod(td.seconds, 3600)
-    return Qt.QTime(hours,
-                    secs_rem        //   60,
-                    secs_rem         %   60,
-                    td.microseconds // 1000)
+    return Qt.QTime(*_timedelta_to_qtime_args(time.value))
+
+
+@lru_cache(maxsize=256)
+def _msecs_to_timedelta(msecs: int) -> timedelta:
+    return timedelta(milliseconds=msecs)
 
 
 def from_qtime(qtime: Qt.QTime, t: Type[TimeType]) -> TimeType:
-    return t(milliseconds=qtime.msecsSinceStartOfDay())
+    return t(_msecs_to_timedelta(qtime.msecsSinceStartOfDay()))
 
 
 # it is a BuiltinMethodType at the same time
 def qt_silent_call(qt_method: Callable[..., T], *args: Any, **kwargs: Any) -> T:
     # https://github.com/python/typing/issues/213
     qobject = qt_method.__self__  # type: ignore
-    block = Qt.QSignalBlocker(qobject)
-    ret = qt_method(*args, **kwargs)
-    del(block)
-    return ret
+    was_blocked = qobject.blockSignals(True)
+    try:
+        return qt_method(*args, **kwargs)
+    finally:
+        qobject.blockSignals(was_blocked)
 
 
 class DeltaTemplate(Template):
     delimiter = '%'
 
 
+@lru_cache(maxsize=32)
+def _delta_template(output_format: str) -> Tuple[DeltaTemplate, FrozenSet[str]]:
+    template = DeltaTemplate(output_format)
+    keys = frozenset(
+        match.group('named') or match.group('braced')
+        for match in DeltaTemplate.pattern.finditer(output_format)
+        if match.group('named') or match.group('braced'))
+    return template, keys
+
+
 def strfdelta(time: Union[TimeType], output_format: str) -> str:
+    template, keys = _delta_template(output_format)
+
     d: MutableMapping[str, str] = {}
     td = time.value
-    hours, secs_rem = divmod(td.seconds, 3600)
-    minutes      = secs_rem // 60
-    seconds      = secs_rem  % 60
-    milliseconds = td.microseconds // 1000
-    d['D'] =   '{:d}'.format(td.days)
-    d['H'] = '{:02d}'.format(hours)
-    d['M'] = '{:02d}'.format(minutes)
-    d['S'] = '{:02d}'.format(seconds)
-    d['Z'] = '{:03d}'.format(milliseconds)
-    d['h'] =   '{:d}'.format(hours)
-    d['m'] =  '{:2d}'.format(minutes)
-    d['s'] =  '{:2d}'.format(seconds)
+    minutes_total, seconds = divmod(td.seconds, 60)
+    hours, minutes = divmod(minutes_total, 60)
+    if 'D' in keys:
+        d['D'] = f'{td.days:d}'
+    if 'H' in keys:
+        d['H'] = f'{hours:02d}'
+    if 'M' in keys:
+        d['M'] = f'{minutes:02d}'
+    if 'S' in keys:
+        d['S'] = f'{seconds:02d}'
+    if 'Z' in keys:
+        d['Z'] = f'{td.microseconds // 1000:03d}'
+    if 'h' in keys:
+        d['h'] = f'{hours:d}'
+    if 'm' in keys:
+        d['m'] = f'{minutes:2d}'
+    if 's' in keys:
+        d['s'] = f'{seconds:2d}'
 
-    template = DeltaTemplate(output_format)
     return template.substitute(**d)
 
 
@@ -83,22 +113,41 @@ def main_window() -> AbstractMainWindow:
     raise RuntimeError
 
 
+@lru_cache()
+def _key_sequence(key: int) -> Qt.QKeySequence:
+    return Qt.QKeySequence(key)
+
+
 def add_shortcut(key: int, handler: Callable[[], None], widget: Optional[Qt.QWidget] = None) -> None:
     if widget is None:
         widget = main_window()
-    Qt.QShortcut(Qt.QKeySequence(key), widget).activated.connect(handler)
+    Qt.QShortcut(_key_sequence(key), widget).activated.connect(handler)
 
 
-def fire_and_forget(f: Callable[..., T]) -> Callable[..., T]:
-    from asyncio import get_event_loop
+@lru_cache(maxsize=1)
+def _fire_and_forget_executor() -> ThreadPoolExecutor:
+    import atexit
+
+    executor = ThreadPoolExecutor(max_workers=get_usable_cpus_count(),
+                                  thread_name_prefix='vspreview-faf')
+    atexit.register(executor.shutdown, wait=False)
+    return executor
+
 
+def _log_future_exception(future: Future[Any]) -> None:
+    # nobody retrieves results of fire-and-forget tasks,
+    # so exceptions would be lost otherwise
+    exception = future.exception()
+    if exception is not None:
+        logging.error('fire_and_forget task failed', exc_info=exception)
+
+
+def fire_and_forget(f: Callable[..., T]) -> Callable[..., T]:
     @wraps(f)
     def wrapped(*args: Any, **kwargs: Any) -> Any:
-        loop = get_event_loop()
-        if callable(f):
-            return loop.run_in_executor(None, partial(f, *args, **kwargs))
-        else:
-            raise TypeError('fire_and_forget(): Task must be a callable')
+        future = _fire_and_forget_executor().submit(f, *args, **kwargs)
+        future.add_done_callback(_log_future_exception)
+        return future
     return wrapped
 
 
@@ -106,15 +155,15 @@ def set_status_label(label: str) -> Callable[..., T]:
     def decorator(func: Callable[..., T]) -> Any:
         @wraps(func)
         def wrapped(*args: Any, **kwargs: Any) -> T:
-            main = main_window()
+            status_label = main_window().statusbar.label
 
-            if main.statusbar.label.text() == 'Ready':
-                main.statusbar.label.setText(label)
+            if status_label.text() == 'Ready':
+                status_label.setText(label)
 
             ret = func(*args, **kwargs)
 
-            if main.statusbar.label.text() == label:
-                main.statusbar.label.setText('Ready')
+            if status_label.text() == label:
+                status_label.setText('Ready')
 
             return ret
         return wrapped
@@ -138,23 +187,19 @@ def method_dispatch(func: Callable[..., T]) -> Callable[..., T]:
 
 
 def set_qobject_names(obj: object) -> None:
-    from vspreview.core import AbstractToolbar
-
     if not hasattr(obj, '__slots__'):
         return
 
-    slots = list(obj.__slots__)
-
-    if 'main' in slots:
-        slots.remove('main')
-
-    for attr_name in slots:
-        attr = getattr(obj, attr_name)
-        if not isinstance(attr, Qt.QObject):
+    prefix = type(obj).__name__ + '.'
+    for attr_name in obj.__slots__:
+        if attr_name == 'main':
             continue
-        attr.setObjectName(type(obj).__name__ + '.' + attr_name)
+        attr = getattr(obj, attr_name, None)
+        if isinstance(attr, Qt.QObject):
+            attr.setObjectName(prefix + attr_name)
 
 
+@lru_cache(maxsize=1)
 def get_usable_cpus_count() -> int:
     from psutil import cpu_count, Process
 
@@ -14,10 +14,10 @@ class ColorView(Qt.QWidget):
         self._color = Qt.QColor(0, 0, 0, 255)
 
     def paintEvent(self, event: Qt.QPaintEvent) -> None:
-        super().paintEvent(event)
-
+        # QWidget.paintEvent() draws nothing, so it isn't called
         painter = Qt.QPainter(self)
-        painter.fillRect(event.rect(), self.color)
+        painter.fillRect(event.rect(), self._color)
+        painter.end()
 
     @property
     def color(self) -> Qt.QColor:
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 import logging
-from typing import cast, Dict, Generic, Optional, Type, TYPE_CHECKING, TypeVar
+from typing import Any, cast, Dict, Generic, Optional, Type, TypeVar
 
 from PyQt5 import Qt
 
@@ -12,15 +12,13 @@ T = TypeVar('T', Output, SceningList, float)
 
 
 class ComboBox(Qt.QComboBox, Generic[T]):
-    def __class_getitem__(cls, ty: Type[T]) -> Type:
-        type_specializations: Dict[Type, Type] = {
-            Output     : _ComboBox_Output,
-            SceningList: _ComboBox_SceningList,
-            float      : _ComboBox_float,
-        }
+    __slots__ = (
+        'oldValue', 'oldIndex',
+    )
 
+    def __class_getitem__(cls, ty: Type[T]) -> Type:
         try:
-            return type_specializations[ty]
+            return _ComboBox_specializations[ty]
         except KeyError:
             raise TypeError
 
@@ -35,9 +33,10 @@ class ComboBox(Qt.QComboBox, Generic[T]):
             Qt.QComboBox.AdjustToMinimumContentsLengthWithIcon)
 
         self.oldValue = self.currentData()
-        self.oldIndex = self.currentIndex()
+        self.oldIndex: int = self.currentIndex()
         self.currentIndexChanged.connect(self._currentIndexChanged)
 
+    @Qt.pyqtSlot(int)
     def _currentIndexChanged(self, newIndex: int) -> None:
         newValue = self.currentData()
         self.valueChanged.emit(newValue, self.oldValue)
@@ -52,26 +51,27 @@ class ComboBox(Qt.QComboBox, Generic[T]):
         i = self.model().index_of(newValue)
         self.setCurrentIndex(i)
 
-
-class _ComboBox_Output(ComboBox):
-    ty = Output
-    if TYPE_CHECKING:
-        valueChanged = Qt.pyqtSignal(Optional[ty], Optional[ty])
-    else:
-        valueChanged = Qt.pyqtSignal(object, object)
+    def setCurrentIndexSilent(self, newIndex: int) -> None:
+        was_blocked = self.blockSignals(True)
+        self.setCurrentIndex(newIndex)
+        self.blockSignals(was_blocked)
+        # keep old value in sync, since _currentIndexChanged() is skipped
+        self.oldIndex = newIndex
+        self.oldValue = self.currentData()
 
 
-class _ComboBox_SceningList(ComboBox):
-    ty = SceningList
-    if TYPE_CHECKING:
-        valueChanged = Qt.pyqtSignal(ty, Optional[ty])
-    else:
-        valueChanged = Qt.pyqtSignal(ty, object)
+def _specialize(ty: type, *signal_types: type) -> Type[ComboBox]:
+    return cast(Type[ComboBox], cast(Any, type(ComboBox))(f'_ComboBox_{ty.__name__}', (ComboBox,), {
+        '__module__'  : __name__,
+        '__slots__'   : (),
+        'ty'          : ty,
+        'valueChanged': Qt.pyqtSignal(*signal_types),
+    }))
 
 
-class _ComboBox_float(ComboBox):
-    ty = float
-    if TYPE_CHECKING:
-        valueChanged = Qt.pyqtSignal(ty, Optional[ty])
-    else:
-        valueChanged = Qt.pyqtSignal(ty, object)
+# values are None when nothing is selected
+_ComboBox_specializations: Dict[Type, Type] = {
+    Output     : _specialize(Output,      object,      object),
+    SceningList: _specialize(SceningList, SceningList, object),
+    float      : _specialize(float,       float,       object),
+}
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 import logging
-from typing import cast, Dict, Generic, Optional, Type
+from typing import Any, cast, Dict, Generic, Optional, Type
 
 from PyQt5 import Qt
 
@@ -11,18 +11,23 @@ from vspreview.core import (
 from vspreview.utils  import debug, from_qtime, to_qtime
 
 
-# TODO: replace specialized Edit classes with some metaclasses magic or such
+def _specialize(base: Type[Qt.QWidget], ty: type) -> Type[Qt.QWidget]:
+    return cast(Type[Qt.QWidget], cast(Any, type(base))(f'_{base.__name__}_{ty.__name__}', (base,), {
+        '__module__'  : __name__,
+        '__slots__'   : (),
+        'ty'          : ty,
+        'valueChanged': Qt.pyqtSignal(ty, ty),
+    }))
 
 
 class FrameEdit(Qt.QSpinBox, Generic[FrameType]):
-    def __class_getitem__(cls, ty: Type[FrameType]) -> Type:
-        type_specializations: Dict[Type, Type] = {
-            Frame        : _FrameEdit_Frame,
-            FrameInterval: _FrameEdit_FrameInterval,
-        }
+    __slots__ = (
+        'oldValue',
+    )
 
+    def __class_getitem__(cls, ty: Type[FrameType]) -> Type:
         try:
-            return type_specializations[ty]
+            return _FrameEdit_specializations[ty]
         except KeyError:
             raise TypeError
 
@@ -36,47 +41,46 @@ class FrameEdit(Qt.QSpinBox, Generic[FrameType]):
         self.oldValue: FrameType = self.value()
         super().valueChanged.connect(self._valueChanged)
 
+    @Qt.pyqtSlot(int)
     def _valueChanged(self, newValue: int) -> None:
-        self.valueChanged.emit(self.value(), self.oldValue)
+        value = self.ty(newValue)
+        self.valueChanged.emit(value, self.oldValue)
+        self.oldValue = value
+
+    # QSpinBox methods are called directly to skip super() proxy creation
 
     def value(self) -> FrameType:  # type: ignore
-        return self.ty(super().value())
+        return self.ty(Qt.QSpinBox.value(self))
 
     def setValue(self, newValue: FrameType) -> None:  # type: ignore
-        super().setValue(int(newValue))
+        Qt.QSpinBox.setValue(self, int(newValue))
 
     def minimum(self) -> FrameType:  # type: ignore
-        return self.ty(super().minimum())
+        return self.ty(Qt.QSpinBox.minimum(self))
 
     def setMinimum(self, newValue: FrameType) -> None:  # type: ignore
-        super().setMinimum(int(newValue))
+        Qt.QSpinBox.setMinimum(self, int(newValue))
 
     def maximum(self) -> FrameType:  # type: ignore
-        return self.ty(super().maximum())
+        return self.ty(Qt.QSpinBox.maximum(self))
 
     def setMaximum(self, newValue: FrameType) -> None:  # type: ignore
-        super().setMaximum(int(newValue))
-
-
-class _FrameEdit_Frame(FrameEdit):
-    ty = Frame
-    valueChanged = Qt.pyqtSignal(ty, ty)
+        Qt.QSpinBox.setMaximum(self, int(newValue))
 
 
-class _FrameEdit_FrameInterval(FrameEdit):
-    ty = FrameInterval
-    valueChanged = Qt.pyqtSignal(ty, ty)
+_FrameEdit_specializations: Dict[Type, Type] = {
+    ty: _specialize(FrameEdit, ty) for ty in (Frame, FrameInterval)
+}
 
 
 class TimeEdit(Qt.QTimeEdit, Generic[TimeType]):
-    def __class_getitem__(cls, ty: Type[TimeType]) -> Type:
-        type_specializations: Dict[Type, Type] = {
-            Time        : _TimeEdit_Time,
-            TimeInterval: _TimeEdit_TimeInterval,
-        }
+    __slots__ = (
+        'oldValue',
+    )
 
+    def __class_getitem__(cls, ty: Type[TimeType]) -> Type:
         try:
-            return type_specializations[ty]
+            return _TimeEdit_specializations[ty]
         except KeyError:
             raise TypeError
 
@@ -92,9 +96,11 @@ class TimeEdit(Qt.QTimeEdit, Generic[TimeType]):
         self.oldValue: TimeType = self.value()
         cast(Qt.pyqtSignal, self.timeChanged).connect(self._timeChanged)
 
+    @Qt.pyqtSlot(Qt.QTime)
     def _timeChanged(self, newValue: Qt.QTime) -> None:
-        self.valueChanged.emit(self.value(), self.oldValue)
-        self.oldValue = self.value()
+        value = self.value()
+        self.valueChanged.emit(value, self.oldValue)
+        self.oldValue = value
 
     def value(self) -> TimeType:
         return from_qtime(super().time(), self.ty)
@@ -115,11 +121,6 @@ class TimeEdit(Qt.QTimeEdit, Generic[TimeType]):
         super().setMaximumTime(to_qtime(newValue))
 
 
-class _TimeEdit_Time(TimeEdit):
-    ty = Time
-    valueChanged = Qt.pyqtSignal(ty, ty)
-
-
-class _TimeEdit_TimeInterval(TimeEdit):
-    ty = TimeInterval
-    valueChanged = Qt.pyqtSignal(ty, ty)
+_TimeEdit_specializations: Dict[Type, Type] = {
+    ty: _specialize(TimeEdit, ty) for ty in (Time, TimeInterval)
+}
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 import logging
-from typing import cast, Optional
+from typing import Callable, cast, Optional
 
 from PyQt5 import Qt
 
@@ -9,72 +9,128 @@ from PyQt5 import Qt
 class GraphicsView(Qt.QGraphicsView):
     WHEEL_STEP = 15 * 8  # degrees
 
+    CONTROL_MODIFIER = int(Qt.Qt.ControlModifier)
+    NO_MODIFIER      = int(Qt.Qt.NoModifier)
+    SHIFT_MODIFIER   = int(Qt.Qt.ShiftModifier)
+
     __slots__ = (
-        'app', 'angleRemainder',
+        'angleRemainder', 'vScrollBar', 'hScrollBar',
+        'zoomTransform', 'wheelHandlers',
+        'pendingScrollV', 'pendingScrollH', 'scrollFlushScheduled',
+        'drag_mode',
+        'mouseMoveHandler', 'mousePressHandler', 'mouseReleaseHandler',
     )
 
-    mouseMoved = Qt.pyqtSignal(Qt.QMouseEvent)
-    mousePressed = Qt.pyqtSignal(Qt.QMouseEvent)
+    mouseMoved    = Qt.pyqtSignal(Qt.QMouseEvent)
+    mousePressed  = Qt.pyqtSignal(Qt.QMouseEvent)
     mouseReleased = Qt.pyqtSignal(Qt.QMouseEvent)
     wheelScrolled = Qt.pyqtSignal(int)
 
     def __init__(self, parent: Optional[Qt.QWidget] = None) -> None:
         super().__init__(parent)
 
-        self.app = Qt.QApplication.instance()
+        self.setViewportUpdateMode(Qt.QGraphicsView.SmartViewportUpdate)
+
+        # mouse events are passed to a single subscriber directly,
+        # in addition to signals, which are costly for every mouse move
+        self.mouseMoveHandler   : Optional[Callable[[Qt.QMouseEvent], None]] = None
+        self.mousePressHandler  : Optional[Callable[[Qt.QMouseEvent], None]] = None
+        self.mouseReleaseHandler: Optional[Callable[[Qt.QMouseEvent], None]] = None
+
         self.angleRemainder = 0
+        # scroll bars are owned by the view and aren't recreated
+        self.vScrollBar = self.verticalScrollBar()
+        self.hScrollBar = self.horizontalScrollBar()
+        # setTransform() copies it, so it's safe to reuse
+        self.zoomTransform = Qt.QTransform()
+
+        # scroll deltas are accumulated and applied
+        # once per event loop iteration
+        self.pendingScrollV = 0
+        self.pendingScrollH = 0
+        self.scrollFlushScheduled = False
+
+        self.wheelHandlers = {
+            self.CONTROL_MODIFIER: self.wheelZoom,
+            self.NO_MODIFIER     : self.wheelScroll,
+            self.SHIFT_MODIFIER  : self.wheelScroll,
+        }
 
     def setZoom(self, value: int) -> None:
-        transform = Qt.QTransform()
-        transform.scale(value, value)
-        self.setTransform(transform)
+        self.zoomTransform.reset()
+        self.zoomTransform.scale(value, value)
+        self.setTransform(self.zoomTransform)
 
     def wheelEvent(self, event: Qt.QWheelEvent) -> None:
-        modifiers = self.app.keyboardModifiers()
-        if modifiers == Qt.Qt.ControlModifier:
-            angleDelta = event.angleDelta().y()
-
-            # check if wheel wasn't rotated the other way since last rotation
-            if self.angleRemainder * angleDelta < 0:
-                self.angleRemainder = 0
-
-            self.angleRemainder += angleDelta
-            if abs(self.angleRemainder) >= self.WHEEL_STEP:
-                self.wheelScrolled.emit(self.angleRemainder // self.WHEEL_STEP)
-                self.angleRemainder %= self.WHEEL_STEP
-            return
-        elif modifiers == Qt.Qt.NoModifier:
-            self.  verticalScrollBar().setValue(
-                self.  verticalScrollBar().value() - event.angleDelta().y())
-            self.horizontalScrollBar().setValue(
-                self.horizontalScrollBar().value() - event.angleDelta().x())
+        modifiers = int(event.modifiers())
+        handler = self.wheelHandlers.get(modifiers)
+        if handler is None:
+            event.ignore()
             return
-        elif modifiers == Qt.Qt.ShiftModifier:
-            self.  verticalScrollBar().setValue(
-                self.  verticalScrollBar().value() - event.angleDelta().x())
-            self.horizontalScrollBar().setValue(
-                self.horizontalScrollBar().value() - event.angleDelta().y())
+        handler(event.angleDelta(), modifiers)
+
+    def wheelZoom(self, angleDelta: Qt.QPoint, modifiers: int) -> None:
+        angleDeltaY = angleDelta.y()
+
+        # check if wheel wasn't rotated the other way since last rotation
+        if angleDeltaY and (self.angleRemainder ^ angleDeltaY) < 0:
+            self.angleRemainder = 0
+
+        angleRemainder = self.angleRemainder + angleDeltaY
+        if abs(angleRemainder) >= self.WHEEL_STEP:
+            # same results as // and %, including negative values
+            steps, angleRemainder = divmod(angleRemainder, self.WHEEL_STEP)
+            self.wheelScrolled.emit(steps)
+        self.angleRemainder = angleRemainder
+
+    def wheelScroll(self, angleDelta: Qt.QPoint, modifiers: int) -> None:
+        dx, dy = angleDelta.x(), angleDelta.y()
+        # Shift swaps scrolling directions
+        if modifiers == self.SHIFT_MODIFIER:
+            dx, dy = dy, dx
+        self.pendingScrollH += dx
+        self.pendingScrollV += dy
+        self.scheduleScrollFlush()
+
+    def scheduleScrollFlush(self) -> None:
+        if self.scrollFlushScheduled:
             return
+        self.scrollFlushScheduled = True
+        Qt.QTimer.singleShot(0, self.flushScroll)
 
-        event.ignore()
+    def flushScroll(self) -> None:
+        self.vScrollBar.setValue(self.vScrollBar.value() - self.pendingScrollV)
+        self.hScrollBar.setValue(self.hScrollBar.value() - self.pendingScrollH)
+        self.pendingScrollV = 0
+        self.pendingScrollH = 0
+        self.scrollFlushScheduled = False
 
     def mouseMoveEvent(self, event: Qt.QMouseEvent) -> None:
         super().mouseMoveEvent(event)
         if self.hasMouseTracking():
-            self.mouseMoved.emit(event)
+            if self.mouseMoveHandler is not None:
+                self.mouseMoveHandler(event)
+            if self.receivers(self.mouseMoved):
+                self.mouseMoved.emit(event)
 
     def mousePressEvent(self, event: Qt.QMouseEvent) -> None:
         if event.button() == Qt.Qt.LeftButton:
             self.drag_mode = self.dragMode()
             self.setDragMode(Qt.QGraphicsView.ScrollHandDrag)
         super().mousePressEvent(event)
-        self.mousePressed.emit(event)
+        if self.mousePressHandler is not None:
+            self.mousePressHandler(event)
+        if self.receivers(self.mousePressed):
+            self.mousePressed.emit(event)
 
     def mouseReleaseEvent(self, event: Qt.QMouseEvent) -> None:
         super().mouseReleaseEvent(event)
         if event.button() == Qt.Qt.LeftButton:
             self.setDragMode(self.drag_mode)
-        self.mouseReleased.emit(event)
+        if self.mouseReleaseHandler is not None:
+            self.mouseReleaseHandler(event)
+        if self.receivers(self.mouseReleased):
+            self.mouseReleased.emit(event)
 
 
 class GraphicsImageItem:
@@ -5,6 +5,10 @@ from PyQt5 import Qt
 
 
 class StatusBar(Qt.QStatusBar):
+    __slots__ = (
+        'permament_start_index',
+    )
+
     def __init__(self, parent: Qt.QWidget) -> None:
         super().__init__(parent)
 
@@ -1,13 +1,15 @@
 from __future__ import annotations
 
-from   enum    import auto, Enum
+from   bisect   import bisect_left, bisect_right
+from   datetime import timedelta
+from   enum     import auto, Enum
 import logging
-from   typing  import (
-    Any, cast, Dict, Iterator, List, Optional, Tuple, Type, Union,
+from   typing   import (
+    Any, Callable, cast, Dict, Iterable, Iterator, List, Optional, Set, Tuple,
+    Type, Union,
 )
 
 from PyQt5 import Qt
-from yaml  import YAMLObject
 
 from vspreview.core import (
     AbstractToolbar, Frame, FrameInterval, Scene, Time, TimeInterval,
@@ -20,10 +22,30 @@ from vspreview.utils import debug
 
 # TODO: store cursor pos as frame
 # TODO: consider moving from ints to floats
-# TODO: make Timeline.Mode a proper class instead of bunch of strings
+
+
+# label formatters, equivalent to strfdelta() with
+# '%h:%M:00', '%m:00' and '%m:%S' respectively
+
+def format_label_h_mm_00(td: timedelta) -> str:
+    hours, seconds = divmod(td.seconds, 3600)
+    return f'{hours:d}:{seconds // 60:02d}:00'
+
+
+def format_label_m_00(td: timedelta) -> str:
+    return f'{td.seconds // 60 % 60:2d}:00'
+
+
+def format_label_m_ss(td: timedelta) -> str:
+    minutes, seconds = divmod(td.seconds % 3600, 60)
+    return f'{minutes:2d}:{seconds:02d}'
 
 
 class Notch:
+    __slots__ = (
+        'data', 'color', 'label', 'line',
+    )
+
     def __init__(self, data: Union[Frame, Time], color: Qt.QColor = cast(Qt.QColor, Qt.Qt.white),
                  label: str = '', line: Qt.QLineF = Qt.QLineF()) -> None:
         self.data  = data
@@ -40,25 +62,72 @@ class Notch:
 class Notches:
     def __init__(self, other: Optional[Notches] = None) -> None:
         self.items: List[Notch] = []
+        # positions of items as plain numbers (frames or seconds),
+        # so that timeline can map them to x without dispatching on type
+        self.values   : List[float] = []
+        self.in_frames: List[bool]  = []
+        # True when lists above can be referenced by another instance,
+        # so they have to be copied before modification
+        self.shared = False
 
         if other is None:
             return
-        self.items = other.items
+        self.items     = other.items
+        self.values    = other.values
+        self.in_frames = other.in_frames
+        self.shared  = True
+        other.shared = True
+
+    def _detach(self) -> None:
+        if not self.shared:
+            return
+        self.items     = list(self.items)
+        self.values    = list(self.values)
+        self.in_frames = list(self.in_frames)
+        self.shared = False
 
     def add(self, data: Union[Frame, Scene, Time, Notch], color: Qt.QColor = cast(Qt.QColor, Qt.Qt.white), label: str = '') -> None:
+        self._detach()
         if isinstance(data, Notch):
-            self.items.append(data)
+            self._append(data)
         elif isinstance(data, Scene):
             if label == '':
                 label = data.label
-            self.items.append(Notch(data.start, color, label))
+            self._append(Notch(data.start, color, label))
             if data.end != data.start:
-                self.items.append(Notch(data.end, color, label))
+                self._append(Notch(data.end, color, label))
         elif isinstance(data, (Frame, Time)):
-            self.items.append(Notch(data, color, label))
+            self._append(Notch(data, color, label))
         else:
             raise TypeError
 
+    def add_scenes(self, scenes: Iterable[Scene], color: Qt.QColor = cast(Qt.QColor, Qt.Qt.white), label: str = '') -> None:
+        # bulk version of add() for scenes, which skips
+        # type dispatch for every scene and every notch
+        self._detach()
+        items_append     = self.items.append
+        values_append    = self.values.append
+        in_frames_append = self.in_frames.append
+        for scene in scenes:
+            scene_label = label if label != '' else scene.label
+            items_append(Notch(scene.start, color, scene_label))
+            values_append(scene.start.value)
+            in_frames_append(True)
+            if scene.end != scene.start:
+                items_append(Notch(scene.end, color, scene_label))
+                values_append(scene.end.value)
+                in_frames_append(True)
+
+    def _append(self, notch: Notch) -> None:
+        # value slots are read directly, bypassing __int__() and __float__()
+        self.items.append(notch)
+        if isinstance(notch.data, Frame):
+            self.values.append(notch.data.value)
+            self.in_frames.append(True)
+        else:
+            self.values.append(notch.data.value.total_seconds())
+            self.in_frames.append(False)
+
     def __len__(self) -> int:
         return len(self.items)
 
@@ -83,9 +152,7 @@ class Timeline(Qt.QWidget):
         'scrollRect',
     )
 
-    class Mode(YAMLObject):
-        yaml_tag = '!Timeline.Mode'
-
+    class Mode(str, Enum):
         FRAME = 'frame'
         TIME  = 'time'
 
@@ -106,110 +173,149 @@ class Timeline(Qt.QWidget):
         self._mode = self.Mode.TIME
 
         self.rect_f  = Qt.QRectF()
+        self.scroll_rect = Qt.QRectF()
 
         self.end_t = Time(seconds=1)
         self.end_f = Frame(1)
 
-        self.notch_interval_target_x = round(75 * self.main.display_scale)
-        self.notch_height            = round( 6 * self.main.display_scale)
-        self.font_height             = round(10 * self.main.display_scale)
-        self.notch_label_interval    = round(-1 * self.main.display_scale)
-        self.notch_scroll_interval   = round( 2 * self.main.display_scale)
-        self.scroll_height           = round(10 * self.main.display_scale)
+        # conversion factors between x and frames or seconds,
+        # updated when either width or end changes
+        self.t_to_x_scale = 0.0
+        self.x_to_t_scale = 0.0
+        self.f_to_x_scale = 0.0
+        self.x_to_f_scale = 0.0
+
+        # notch intervals multiplied by margin, which label
+        # notch intervals are looked up in
+        self.notch_thresholds_margin: Optional[float] = None
+        self.notch_thresholds_t: List[timedelta] = []
+        self.notch_thresholds_f: List[int] = []
+
+        display_scale = self.main.display_scale
+        self.notch_interval_target_x = round(75 * display_scale)
+        self.notch_height            = round( 6 * display_scale)
+        self.font_height             = round(10 * display_scale)
+        self.notch_label_interval    = round(-1 * display_scale)
+        self.notch_scroll_interval   = round( 2 * display_scale)
+        self.scroll_height           = round(10 * display_scale)
 
         self.setMinimumSize(self.notch_interval_target_x,
-                            round(33 * self.main.display_scale))
+                            round(33 * display_scale))
 
         font = self.font()
         font.setPixelSize(self.font_height)
         self.setFont(font)
 
         self.cursor_x = 0
+        # conversions of positions accepted by set_position() to x
+        self.position_to_x: Dict[type, Callable[[Any], int]] = {
+            Frame: self.f_to_x,
+            Time : self.t_to_x,
+            int  : int,
+        }
         # used as a fallback when self.rectF.width() is 0,
         # so cursorX is incorrect
         self.cursor_ftx: Optional[Union[Frame, Time, int]] = None
         # False means that only cursor position'll be recalculated
         self.need_full_repaint = True
+        # label notches and their labels are rendered once
+        # and reused until anything they depend on changes
+        self.ruler_pixmap = Qt.QPixmap()
+        self.ruler_key: Optional[Tuple[Any, ...]] = None
 
         self.toolbars_notches: Dict[AbstractToolbar, Notches] = {}
+        # None stands for all toolbars
+        self.pending_notches_toolbars: Set[Optional[AbstractToolbar]] = set()
+        self.notches_update_scheduled = False
+        # notches of visible toolbars sorted by x for hit testing
+        self.toolbars_notches_x: Dict[AbstractToolbar, Tuple[List[float], List[Notch]]] = {}
+        # lines of notches of visible toolbars grouped by color's RGBA,
+        # sorted by x along with a list of their x and a pen to draw them
+        self.notch_lines_by_color: Dict[int, Tuple[Qt.QPen, List[float], List[Qt.QLineF]]] = {}
+
+        self.scroll_brush = Qt.QBrush(Qt.Qt.gray)
+        self.cursor_pen   = Qt.QPen(Qt.Qt.black)
+        self.refresh_palette_cache()
 
         self.setAttribute(Qt.Qt.WA_OpaquePaintEvent)
         self.setMouseTracking(True)
 
     def paintEvent(self, event: Qt.QPaintEvent) -> None:
         super().paintEvent(event)
-        self.rect_f = Qt.QRectF(event.rect())
+        # event.rect() is only a part of the widget
+        # when just the cursor is repainted
+        self.rect_f = Qt.QRectF(self.rect())
         # self.rectF.adjust(0, 0, -1, -1)
+        self.refresh_scales()
 
         if self.cursor_ftx is not None:
             self.set_position(self.cursor_ftx)
         self.cursor_ftx = None
 
         painter = Qt.QPainter(self)
-        self.drawWidget(painter)
-
-    def drawWidget(self, painter: Qt.QPainter) -> None:
-        from copy import deepcopy
-
-        from vspreview.utils import strfdelta
+        self.drawWidget(painter, event.rect())
 
+    def drawWidget(self, painter: Qt.QPainter, exposed_rect: Qt.QRect) -> None:
         # calculations
 
         if self.need_full_repaint:
-            labels_notches = Notches()
             label_notch_bottom = (self.rect_f.top() + self.font_height
                                   + self.notch_label_interval
                                   + self.notch_height + 5)
-            label_notch_top    = label_notch_bottom - self.notch_height
-            label_notch_x = self.rect_f.left()
-
-            if self.mode == self.Mode.TIME:
-                notch_interval_t = self.calculate_notch_interval_t(
-                    self.notch_interval_target_x)
-                label_format  = self.generate_label_format(notch_interval_t,
-                                                           TimeInterval(self.end_t.value))
-                label_notch_t = Time()
-
-                while (label_notch_x < self.rect_f.right()
-                        and label_notch_t <= self.end_t):
-                    line = Qt.QLineF(label_notch_x, label_notch_bottom,
-                                     label_notch_x, label_notch_top)
-                    labels_notches.add(Notch(deepcopy(label_notch_t),
-                                             line=line))
-                    label_notch_t += notch_interval_t
-                    label_notch_x  = self.t_to_x(label_notch_t)
-
-            elif self.mode == self.Mode.FRAME:
-                notch_interval_f = self.calculate_notch_interval_f(
-                    self.notch_interval_target_x)
-                label_notch_f    = Frame(0)
-
-                while (label_notch_x < self.rect_f.right()
-                        and label_notch_f <= self.end_f):
-                    line = Qt.QLineF(label_notch_x, label_notch_bottom,
-                                     label_notch_x, label_notch_top)
-                    labels_notches.add(Notch(deepcopy(label_notch_f),
-                                             line=line))
-                    label_notch_f += notch_interval_f
-                    label_notch_x  = self.f_to_x(label_notch_f)
 
             self.scroll_rect = Qt.QRectF(
                 self.rect_f.left(),
                 label_notch_bottom + self.notch_scroll_interval,
                 self.rect_f.width(), self.scroll_height)
 
+            f_scale = self.f_to_x_scale
+            t_scale = self.t_to_x_scale
+            y1 = self.scroll_rect.top()
+            y2 = y1 + self.scroll_rect.height() - 1
+
+            self.toolbars_notches_x.clear()
+            lines_by_color: Dict[int, List[Qt.QLineF]] = {}
             for toolbar, notches in self.toolbars_notches.items():
                 if not toolbar.is_notches_visible():
                     continue
 
-                for notch in notches:
-                    if   isinstance(notch.data, Frame):
-                        x = self.f_to_x(notch.data)
-                    elif isinstance(notch.data, Time):
-                        x = self.t_to_x(notch.data)
-                    y = self.scroll_rect.top()
-                    notch.line = Qt.QLineF(
-                        x, y, x, y + self.scroll_rect.height() - 1)
+                for notch, value, in_frames in zip(notches, notches.values, notches.in_frames):
+                    x = round(value * (f_scale if in_frames else t_scale))
+                    notch.line = Qt.QLineF(x, y1, x, y2)
+                    lines_by_color.setdefault(
+                        Qt.QColor(notch.color).rgba(), []).append(notch.line)
+
+                # sort is stable, so the first notch
+                # at a given x is still found first
+                sorted_notches = sorted(notches, key=lambda notch: notch.line.x1())
+                self.toolbars_notches_x[toolbar] = (
+                    [notch.line.x1() for notch in sorted_notches],
+                    sorted_notches)
+
+            self.notch_lines_by_color.clear()
+            for rgba, lines in lines_by_color.items():
+                lines.sort(key=Qt.QLineF.x1)
+                # notches of the same color that fall
+                # into the same pixel column are drawn once
+                unique_lines_x: List[float] = []
+                unique_lines: List[Qt.QLineF] = []
+                for line in lines:
+                    line_x = line.x1()
+                    if unique_lines_x and unique_lines_x[-1] == line_x:
+                        continue
+                    unique_lines_x.append(line_x)
+                    unique_lines.append(line)
+                self.notch_lines_by_color[rgba] = (
+                    Qt.QPen(Qt.QColor.fromRgba(rgba)),
+                    unique_lines_x, unique_lines)
+
+            ruler_key = (self.rect_f.left(), self.rect_f.top(),
+                         self.rect_f.width(), self.rect_f.height(),
+                         self.devicePixelRatioF(), self.end_f.value,
+                         self.end_t.value, self.mode, self.font_height)
+            if ruler_key != self.ruler_key:
+                self.ruler_pixmap = self.render_ruler(label_notch_bottom)
+                self.ruler_key = ruler_key
 
         cursor_line = Qt.QLineF(
             self.cursor_x, self.scroll_rect.top(), self.cursor_x,
@@ -217,74 +323,151 @@ class Timeline(Qt.QWidget):
 
         # drawing
 
-        if self.need_full_repaint:
-            painter.fillRect(self.rect_f,
-                             self.palette().color(Qt.QPalette.Window))
-
-            painter.setPen(
-                Qt.QPen(self.palette().color(Qt.QPalette.WindowText)))
-            painter.setRenderHint(Qt.QPainter.Antialiasing, False)
-            painter.drawLines([notch.line for notch in labels_notches])
-
-            painter.setRenderHint(Qt.QPainter.Antialiasing)
-            for i, notch in enumerate(labels_notches):
-                line = notch.line
-                anchor_rect = Qt.QRectF(
-                    line.x2(), line.y2() - self.notch_label_interval, 0, 0)
-
-                if self.mode == self.Mode.TIME:
-                    time  = cast(Time, notch.data)
-                    label = strfdelta(time, label_format)
-                if self.mode == self.Mode.FRAME:
-                    label = str(notch.data)
-
-                if i == 0:
-                    rect = painter.boundingRect(
-                        anchor_rect, Qt.Qt.AlignBottom + Qt.Qt.AlignLeft,
-                        label)
-                    if self.mode == self.Mode.TIME:
-                        rect.moveLeft(-2.5)
-                elif i == (len(labels_notches) - 1):
-                    rect = painter.boundingRect(
-                        anchor_rect, Qt.Qt.AlignBottom + Qt.Qt.AlignHCenter,
-                        label)
-                    if rect.right() > self.rect_f.right():
-                        rect = painter.boundingRect(
-                            anchor_rect, Qt.Qt.AlignBottom + Qt.Qt.AlignRight,
-                            label)
-                else:
-                    rect = painter.boundingRect(
-                        anchor_rect, Qt.Qt.AlignBottom + Qt.Qt.AlignHCenter,
-                        label)
-                painter.drawText(rect, label)
-
-        painter.setRenderHint(Qt.QPainter.Antialiasing, False)
-        painter.fillRect(self.scroll_rect, Qt.Qt.gray)
-
-        for toolbar, notches in self.toolbars_notches.items():
-            if not toolbar.is_notches_visible():
-                continue
+        if (self.need_full_repaint
+                or not self.scroll_rect.contains(Qt.QRectF(exposed_rect))):
+            painter.drawPixmap(self.rect_f.topLeft(), self.ruler_pixmap)
 
-            for notch in notches:
-                painter.setPen(notch.color)
-                painter.drawLine(notch.line)
+        # antialiasing is off for a new painter, and nothing here needs it
+        painter.fillRect(self.scroll_rect, self.scroll_brush)
 
-        painter.setPen(Qt.Qt.black)
+        # only notches inside exposed area are drawn
+        exposed_left  = exposed_rect.left()  - 1
+        exposed_right = exposed_rect.right() + 1
+        for pen, lines_x, lines in self.notch_lines_by_color.values():
+            first = bisect_left(lines_x, exposed_left)
+            last  = bisect_right(lines_x, exposed_right)
+            if first == last:
+                continue
+            painter.setPen(pen)
+            # stubs accept only sip.array, but lists work as well
+            painter.drawLines(lines[first:last])  # type: ignore
+
+        painter.setPen(self.cursor_pen)
         painter.drawLine(cursor_line)
 
         self.need_full_repaint = False
 
+    def render_ruler(self, label_notch_bottom: float) -> Qt.QPixmap:
+        # calculations
+
+        labels_notches = Notches()
+        # label notches are on whole pixels, so integer QLine is used
+        label_lines: List[Qt.QLine] = []
+        label_notch_bottom_i = round(label_notch_bottom)
+        label_notch_top      = label_notch_bottom_i - self.notch_height
+        right = self.rect_f.right()
+        # None means the first label is aligned to its notch
+        first_label_left: Optional[float] = None
+
+        # label notches are generated by index, so each of them
+        # gets its own value without copying an accumulator;
+        # labels are formatted here, where mode is already known
+        if self._mode is self.Mode.TIME:
+            notch_interval_t = self.calculate_notch_interval_t(
+                self.notch_interval_target_x)
+            label_format  = self.generate_label_format(notch_interval_t,
+                                                       TimeInterval(self.end_t.value))
+            interval = notch_interval_t.value
+
+            for i in range(self.end_t.value // interval + 1):
+                label_notch_t = Time(interval * i)
+                label_notch_x = self.t_to_x(label_notch_t)
+                if label_notch_x >= right:
+                    break
+                label_lines.append(Qt.QLine(label_notch_x, label_notch_bottom_i,
+                                            label_notch_x, label_notch_top))
+                labels_notches.add(Notch(label_notch_t, label=label_format(label_notch_t.value)))
+
+            first_label_left = -2.5
+
+        elif self._mode is self.Mode.FRAME:
+            notch_interval_f = self.calculate_notch_interval_f(
+                self.notch_interval_target_x)
+
+            for f in range(0, int(self.end_f) + 1, int(notch_interval_f)):
+                label_notch_x = round(f * self.f_to_x_scale)
+                if label_notch_x >= right:
+                    break
+                label_lines.append(Qt.QLine(label_notch_x, label_notch_bottom_i,
+                                            label_notch_x, label_notch_top))
+                labels_notches.add(Notch(Frame(f), label=str(f)))
+
+        # drawing
+
+        dpr = self.devicePixelRatioF()
+        pixmap = Qt.QPixmap((self.rect_f.size() * dpr).toSize())
+        pixmap.setDevicePixelRatio(dpr)
+
+        painter = Qt.QPainter(pixmap)
+        painter.setFont(self.font())
+        # pixmap is drawn at self.rect_f.topLeft()
+        painter.translate(-self.rect_f.topLeft())
+
+        painter.fillRect(self.rect_f, self.background_brush)
+
+        # all lines are drawn first, while antialiasing is still off,
+        # then it's turned on once for all labels
+        painter.setPen(self.text_pen)
+        painter.drawLines(label_lines)  # type: ignore
+
+        # labels are laid out from font metrics instead of
+        # painter.boundingRect(), which lays out text on every call
+        font_metrics = Qt.QFontMetricsF(painter.font())
+        # labels are bottom-aligned to the top of the notches
+        baseline_offset = font_metrics.ascent() - font_metrics.height()
+        last_i = len(labels_notches) - 1
+
+        painter.setRenderHint(Qt.QPainter.Antialiasing)
+        for i, (notch, line) in enumerate(zip(labels_notches, label_lines)):
+            anchor_x: float = line.x2()
+            baseline = line.y2() - self.notch_label_interval + baseline_offset
+            label = notch.label
+
+            width = font_metrics.horizontalAdvance(label)
+            if i == 0:
+                # left-aligned
+                left = anchor_x
+                if first_label_left is not None:
+                    left = first_label_left
+            else:
+                # centered, or right-aligned if the last one doesn't fit
+                left = anchor_x - width / 2
+                if i == last_i and left + width > self.rect_f.right():
+                    left = anchor_x - width
+            painter.drawText(Qt.QPointF(left, baseline), label)
+
+        painter.end()
+        return pixmap
+
+    def refresh_palette_cache(self) -> None:
+        palette = self.palette()
+        self.background_brush = Qt.QBrush(palette.color(Qt.QPalette.Window))
+        self.text_pen         = Qt.QPen(palette.color(Qt.QPalette.WindowText))
+
     def full_repaint(self) -> None:
         self.need_full_repaint = True
         self.update()
 
+    def update_cursor(self, old_x: int, new_x: int) -> None:
+        if self.need_full_repaint:
+            self.update()
+            return
+
+        # only narrow strips of the scroll area around old and new
+        # cursor positions are repainted, Qt merges them into
+        # event's region and clips painting to it
+        scroll_rect = self.scroll_rect.toAlignedRect()
+        self.update(Qt.QRect(old_x - 2, scroll_rect.top(), 5, scroll_rect.height()))
+        if new_x != old_x:
+            self.update(Qt.QRect(new_x - 2, scroll_rect.top(), 5, scroll_rect.height()))
+
     def moveEvent(self, event: Qt.QMoveEvent) -> None:
         super().moveEvent(event)
         self.full_repaint()
 
     def mousePressEvent(self, event: Qt.QMouseEvent) -> None:
         super().mousePressEvent(event)
-        pos = Qt.QPoint(event.pos())
+        pos = event.pos()
         if self.scroll_rect.contains(pos):
             self.set_position(pos.x())
             self.clicked.emit(self.x_to_f(self.cursor_x, Frame),
@@ -292,14 +475,14 @@ class Timeline(Qt.QWidget):
 
     def mouseMoveEvent(self, event: Qt.QMouseEvent) -> None:
         super().mouseMoveEvent(event)
-        for toolbar, notches in self.toolbars_notches.items():
+        x = event.x()
+        for toolbar, (notches_x, notches) in self.toolbars_notches_x.items():
             if not toolbar.is_notches_visible():
                 continue
-            for notch in notches:
-                line = notch.line
-                if line.x1() - 0.5 <= event.x() <= line.x1() + 0.5:
-                    Qt.QToolTip.showText(event.globalPos(), notch.label)
-                    return
+            i = bisect_left(notches_x, x - 0.5)
+            if i < len(notches_x) and notches_x[i] <= x + 0.5:
+                Qt.QToolTip.showText(event.globalPos(), notches[i].label)
+                return
 
     def resizeEvent(self, event: Qt.QResizeEvent) -> None:
         super().resizeEvent(event)
@@ -309,26 +492,44 @@ class Timeline(Qt.QWidget):
         if event.type() in (Qt.QEvent.Polish,
                             Qt.QEvent.ApplicationPaletteChange):
             self.setPalette(self.main.palette())
+            self.refresh_palette_cache()
+            # ruler has to be rendered with the new palette
+            self.ruler_key = None
             self.full_repaint()
             return True
 
         return super().event(event)
 
     def update_notches(self, toolbar: Optional[AbstractToolbar] = None) -> None:
-        if toolbar is not None:
+        # notches are requested from toolbars once per event loop
+        # iteration, no matter how many times they were changed
+        self.pending_notches_toolbars.add(toolbar)
+        if self.notches_update_scheduled:
+            return
+        self.notches_update_scheduled = True
+        Qt.QTimer.singleShot(0, self.flush_notches)
+
+    def flush_notches(self) -> None:
+        if None in self.pending_notches_toolbars:
+            toolbars = list(self.main.toolbars)
+        else:
+            toolbars = cast(List[AbstractToolbar], list(self.pending_notches_toolbars))
+        self.pending_notches_toolbars.clear()
+        self.notches_update_scheduled = False
+
+        for toolbar in toolbars:
             self.toolbars_notches[toolbar] = toolbar.get_notches()
-        if toolbar is None:
-            for t in self.main.toolbars:
-                self.toolbars_notches[t] = t.get_notches()
         self.full_repaint()
 
     @property
-    def mode(self) -> str:  # pylint: disable=undefined-variable
+    def mode(self) -> Timeline.Mode:
         return self._mode
 
     @mode.setter
-    def mode(self, value: str) -> None:
-        if value == self._mode:
+    def mode(self, value: Union[Timeline.Mode, str]) -> None:
+        # plain strings come from storage
+        value = self.Mode(value)
+        if value is self._mode:
             return
 
         self._mode = value
@@ -356,14 +557,11 @@ class Timeline(Qt.QWidget):
     )
 
     def calculate_notch_interval_t(self, target_interval_x: int) -> TimeInterval:
-        margin = 1 + self.main.TIMELINE_LABEL_NOTCHES_MARGIN / 100
+        self.refresh_notch_thresholds()
         target_interval_t = self.x_to_t(target_interval_x, TimeInterval)
-        if target_interval_t >= self.notch_intervals_t[-1] * margin:
-            return self.notch_intervals_t[-1]
-        for interval in self.notch_intervals_t:
-            if target_interval_t < interval * margin:
-                return interval
-        raise RuntimeError
+        # first interval which threshold is greater than target
+        i = bisect_right(self.notch_thresholds_t, target_interval_t.value)
+        return self.notch_intervals_t[min(i, len(self.notch_intervals_t) - 1)]
 
     notch_intervals_f = (
         FrameInterval(    1),
@@ -391,35 +589,47 @@ class Timeline(Qt.QWidget):
     )
 
     def calculate_notch_interval_f(self, target_interval_x: int) -> FrameInterval:
-        margin = 1 + self.main.TIMELINE_LABEL_NOTCHES_MARGIN / 100
+        self.refresh_notch_thresholds()
         target_interval_f = self.x_to_f(target_interval_x, FrameInterval)
-        if target_interval_f >= FrameInterval(
-                round(int(self.notch_intervals_f[-1]) * margin)):
-            return self.notch_intervals_f[-1]
-        for interval in self.notch_intervals_f:
-            if target_interval_f < FrameInterval(
-                    round(int(interval) * margin)):
-                return interval
-        raise RuntimeError
-
-    def generate_label_format(self, notch_interval_t: TimeInterval, end_time: TimeInterval) -> str:
+        # first interval which threshold is greater than target
+        i = bisect_right(self.notch_thresholds_f, int(target_interval_f))
+        return self.notch_intervals_f[min(i, len(self.notch_intervals_f) - 1)]
+
+    def refresh_notch_thresholds(self) -> None:
+        margin = 1 + self.main.TIMELINE_LABEL_NOTCHES_MARGIN / 100
+        if margin == self.notch_thresholds_margin:
+            return
+
+        self.notch_thresholds_t = [interval.value * margin
+                                   for interval in self.notch_intervals_t]
+        self.notch_thresholds_f = [round(int(interval) * margin)
+                                   for interval in self.notch_intervals_f]
+        self.notch_thresholds_margin = margin
+
+    def generate_label_format(self, notch_interval_t: TimeInterval, end_time: TimeInterval) -> Callable[[timedelta], str]:
         if   end_time >= TimeInterval(hours=1):
-            return '%h:%M:00'
+            return format_label_h_mm_00
         elif notch_interval_t >= TimeInterval(minutes=1):
-            return '%m:00'
+            return format_label_m_00
         else:
-            return '%m:%S'
+            return format_label_m_ss
 
     def set_end_frame(self, end_f: Frame) -> None:
         self.end_f = end_f
         self.end_t = Time(end_f)
+        self.refresh_scales()
         self.full_repaint()
 
     def set_position(self, pos: Union[Frame, Time, int]) -> None:
         if self.rect_f.width() == 0.0:
             self.cursor_ftx = pos
 
-        if   isinstance(pos, Frame):
+        old_x = self.cursor_x
+        to_x = self.position_to_x.get(type(pos))
+        if to_x is not None:
+            self.cursor_x = to_x(pos)
+        # subclasses aren't in the lookup table
+        elif isinstance(pos, Frame):
             self.cursor_x = self.f_to_x(pos)
         elif isinstance(pos, Time):
             self.cursor_x = self.t_to_x(pos)
@@ -427,29 +637,27 @@ class Timeline(Qt.QWidget):
             self.cursor_x = pos
         else:
             raise TypeError
-        self.update()
+        self.update_cursor(old_x, self.cursor_x)
 
-    def t_to_x(self, t: TimeType) -> int:
+    def refresh_scales(self) -> None:
         width = self.rect_f.width()
-        try:
-            x = round(float(t) / float(self.end_t) * width)
-        except ZeroDivisionError:
-            x = 0
-        return x
+        end_t = float(self.end_t)
+        end_f = int(self.end_f)
+
+        self.t_to_x_scale = width / end_t if end_t != 0 else 0.0
+        self.x_to_t_scale = end_t / width if width != 0 else 0.0
+        self.f_to_x_scale = width / end_f if end_f != 0 else 0.0
+        self.x_to_f_scale = end_f / width if width != 0 else 0.0
+
+    def t_to_x(self, t: TimeType) -> int:
+        # value slots are read directly, bypassing __float__() and __int__()
+        return round(t.value.total_seconds() * self.t_to_x_scale)
 
     def x_to_t(self, x: int, ty: Type[TimeType]) -> TimeType:
-        width = self.rect_f.width()
-        return ty(seconds=(x * float(self.end_t) / width))
+        return ty(seconds=(x * self.x_to_t_scale))
 
     def f_to_x(self, f: FrameType) -> int:
-        width = self.rect_f.width()
-        try:
-            x = round(int(f) / int(self.end_f) * width)
-        except ZeroDivisionError:
-            x = 0
-        return x
+        return round(f.value * self.f_to_x_scale)
 
     def x_to_f(self, x: int, ty: Type[FrameType]) -> FrameType:
-        width = self.rect_f.width()
-        value = round(x / width * int(self.end_f))
-        return ty(value)
+        return ty(round(x * self.x_to_f_scale))